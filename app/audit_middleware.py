@@ -0,0 +1,27 @@
+"""Attribution of audit events to the caller of each request."""
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .services.audit_service import current_actor
+
+
+class AuditActorMiddleware:
+    def __init__(self, app: ASGIApp, header: str = "X-Actor"):
+        """
+        Args:
+            app: ASGI application to wrap
+            header: Request header naming the caller
+        """
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_actor.set(Headers(scope=scope).get(self.header, "anonymous"))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_actor.reset(token)
@@ -0,0 +1,122 @@
+"""Response compression negotiated from the Accept-Encoding header."""
+import gzip
+from typing import Dict, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli installed
+    brotli = None
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """
+    Get the quality value of each encoding listed in an Accept-Encoding header.
+
+    Args:
+        value: Accept-Encoding header value
+
+    Returns:
+        Mapping of lowercase encoding name (or "*") to its quality value
+    """
+    encodings = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, param_value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        offload_size: int = 256 * 1024,
+    ):
+        """
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Smallest response body, in bytes, that is compressed
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: Brotli quality (0-11)
+            offload_size: Bodies larger than this are compressed in a worker thread
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = parse_accept_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        wildcard = accepted.get("*", 0.0)
+        supported = ("br", "gzip") if brotli is not None else ("gzip",)
+        # Highest quality value wins; ties go to the first supported encoding
+        best, best_quality = None, 0.0
+        for name in supported:
+            quality = accepted.get(name, wildcard)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._choose_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                # Streaming, small or already encoded responses are sent as is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) > self.offload_size:
+                body = await anyio.to_thread.run_sync(self._compress, body, encoding)
+            else:
+                body = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
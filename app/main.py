@@ -1,17 +1,45 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response
+from contextlib import asynccontextmanager
+from datetime import datetime
 import logging
 import os
-from typing import List
-from .models import Secret, Project
+from typing import List, Optional
+from .audit_middleware import AuditActorMiddleware
+from .compression import CompressionMiddleware
+from .models import Secret, Project, ProjectClone, ProjectSummary, AuditEvent, AuditMetrics, SearchMatch, SearchResults
+from .serialization import ResponseSerializer
+from .services.audit_service import AuditService
 from .services.projects_service import ProjectsService
+from .services.search_index import MIN_SUBSTRING_LENGTH
+
+# Create single instance of ResponseSerializer
+response_serializer = ResponseSerializer.from_env()
+
+# Create single instance of AuditService
+audit_service = AuditService(
+    db_path=os.environ.get("AUDIT_DB_PATH", "audit.db"),
+    max_queue_size=int(os.environ.get("AUDIT_QUEUE_SIZE", "10000")),
+    batch_size=int(os.environ.get("AUDIT_BATCH_SIZE", "500")),
+    flush_interval=float(os.environ.get("AUDIT_FLUSH_INTERVAL", "1.0")),
+    max_rows=int(os.environ.get("AUDIT_MAX_ROWS", "1000000")),
+    max_age=float(os.environ.get("AUDIT_MAX_AGE", str(30 * 24 * 3600)))
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_service.start()
+    yield
+    await audit_service.stop()
+    response_serializer.shutdown()
 
 app = FastAPI(
     title="Secrets API",
     description="API for managing secrets",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -23,6 +51,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses with brotli or gzip, as negotiated by the client
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "1024")),
+    gzip_level=int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4")),
+    offload_size=int(os.environ.get("COMPRESSION_OFFLOAD_SIZE", str(256 * 1024)))
+)
+
+# Attribute audit events to the caller named in the X-Actor header
+app.add_middleware(AuditActorMiddleware)
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -39,7 +79,7 @@ async def root():
     return HTMLResponse(content=html_content, status_code=200)
 
 # Create single instance of ProjectsService
-projects_service = ProjectsService()
+projects_service = ProjectsService(audit_service)
 
 def get_projects_service() -> ProjectsService:
     """
@@ -50,6 +90,24 @@ def get_projects_service() -> ProjectsService:
     """
     return projects_service
 
+def get_audit_service() -> AuditService:
+    """
+    Dependency injection for AuditService.
+
+    Returns:
+        Instance of AuditService
+    """
+    return audit_service
+
+def get_response_serializer() -> ResponseSerializer:
+    """
+    Dependency injection for ResponseSerializer.
+
+    Returns:
+        Instance of ResponseSerializer
+    """
+    return response_serializer
+
 @app.post("/projects/", response_model=Project)
 async def create_project(
     project: Project,
@@ -60,21 +118,23 @@ async def create_project(
 
 @app.get("/projects/", response_model=List[Project])
 async def list_projects(
-    service: ProjectsService = Depends(get_projects_service)
-) -> List[Project]:
+    service: ProjectsService = Depends(get_projects_service),
+    serializer: ResponseSerializer = Depends(get_response_serializer)
+) -> Response:
     """List all projects"""
-    return await service.list_projects()
+    return await serializer.render(await service.list_projects())
 
 @app.get("/projects/{identifier}", response_model=Project)
 async def get_project(
     identifier: str,
-    service: ProjectsService = Depends(get_projects_service)
-) -> Project:
+    service: ProjectsService = Depends(get_projects_service),
+    serializer: ResponseSerializer = Depends(get_response_serializer)
+) -> Response:
     """Get a project by identifier"""
     project = await service.get_project(identifier)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return await serializer.render(project)
 
 @app.put("/projects/{identifier}", response_model=Project)
 async def update_project(
@@ -98,6 +158,22 @@ async def delete_project(
         raise HTTPException(status_code=404, detail="Project not found")
     return True
 
+@app.post("/projects/{identifier}/clone", response_model=ProjectSummary)
+async def clone_project(
+    identifier: str,
+    clone: ProjectClone,
+    service: ProjectsService = Depends(get_projects_service)
+) -> ProjectSummary:
+    """Clone a project, sharing its secrets copy-on-write"""
+    project = await service.clone_project(identifier, clone.name)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return ProjectSummary(
+        identifier=project.identifier,
+        name=project.name,
+        secret_count=len(project.secrets)
+    )
+
 @app.post("/projects/{identifier}/secrets", response_model=Project)
 async def create_secret(
     identifier: str,
@@ -145,3 +221,41 @@ async def delete_secret(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
+
+@app.get("/search", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, description="Search text"),
+    match: SearchMatch = SearchMatch.TOKEN,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    service: ProjectsService = Depends(get_projects_service)
+) -> SearchResults:
+    """Search project and secret names"""
+    if match == SearchMatch.SUBSTRING and len(q) < MIN_SUBSTRING_LENGTH:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Substring queries need at least {MIN_SUBSTRING_LENGTH} characters"
+        )
+    return await service.search(q, match, offset, limit)
+
+@app.get("/audit/events", response_model=List[AuditEvent])
+def list_audit_events(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    project_id: Optional[str] = None,
+    actor: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    service: AuditService = Depends(get_audit_service)
+) -> List[AuditEvent]:
+    """List audit events, optionally filtered by time range, project and actor"""
+    return service.query(
+        start=start, end=end, project_id=project_id, actor=actor, limit=limit, offset=offset
+    )
+
+@app.get("/audit/metrics", response_model=AuditMetrics)
+async def get_audit_metrics(
+    service: AuditService = Depends(get_audit_service)
+) -> AuditMetrics:
+    """Get audit queue depth and dropped event counts"""
+    return service.metrics()
@@ -1,5 +1,6 @@
+from datetime import datetime
 from enum import Enum
-from typing import List, ForwardRef
+from typing import List, ForwardRef, Optional
 from pydantic import BaseModel, Field
 from ulid import ULID
 
@@ -7,6 +8,23 @@ class Source(str, Enum):
     AWS_SAM = "AWS_SAM"
     OTHER = "OTHER"
 
+class AuditAction(str, Enum):
+    LIST_PROJECTS = "LIST_PROJECTS"
+    READ_PROJECT = "READ_PROJECT"
+    CREATE_PROJECT = "CREATE_PROJECT"
+    UPDATE_PROJECT = "UPDATE_PROJECT"
+    DELETE_PROJECT = "DELETE_PROJECT"
+    CLONE_PROJECT = "CLONE_PROJECT"
+    LIST_SECRETS = "LIST_SECRETS"
+    CREATE_SECRET = "CREATE_SECRET"
+    UPDATE_SECRET = "UPDATE_SECRET"
+    DELETE_SECRET = "DELETE_SECRET"
+    SEARCH = "SEARCH"
+
+class SearchMatch(str, Enum):
+    TOKEN = "token"
+    SUBSTRING = "substring"
+
 class Secret(BaseModel):
     name: str = Field(..., description="Name of the secret")
     value: str = Field(..., description="Value of the secret")
@@ -23,3 +41,39 @@ class Project(BaseModel):
         default_factory=lambda: str(ULID()),
         description="ULID identifier"
     )
+
+class ProjectClone(BaseModel):
+    name: str = Field(..., description="Name of the cloned project")
+
+class ProjectSummary(BaseModel):
+    identifier: str = Field(..., description="ULID identifier")
+    name: str = Field(..., description="Name of the project")
+    secret_count: int = Field(..., description="Number of secrets in the project")
+
+class AuditEvent(BaseModel):
+    timestamp: datetime = Field(..., description="Time the event was recorded (UTC)")
+    actor: str = Field(..., description="Caller that performed the action")
+    action: AuditAction = Field(..., description="Action performed")
+    project_id: Optional[str] = Field(default=None, description="Project identifier")
+    secret_id: Optional[str] = Field(default=None, description="Secret identifier")
+
+class AuditMetrics(BaseModel):
+    queue_depth: int = Field(..., description="Events waiting to be written")
+    queue_capacity: int = Field(..., description="Maximum number of queued events")
+    dropped_events: int = Field(..., description="Events dropped because the queue was full")
+    written_events: int = Field(..., description="Events written to the audit store")
+    pruned_events: int = Field(..., description="Events deleted by the retention policy")
+    retention_max_rows: int = Field(..., description="Maximum number of stored events, 0 if unlimited")
+    retention_max_age: float = Field(..., description="Maximum age of stored events in seconds, 0 if unlimited")
+
+class SearchResult(BaseModel):
+    project_id: str = Field(..., description="Project identifier")
+    project_name: str = Field(..., description="Project name")
+    secret_id: Optional[str] = Field(default=None, description="Secret identifier, if a secret matched")
+    secret_name: Optional[str] = Field(default=None, description="Secret name, if a secret matched")
+
+class SearchResults(BaseModel):
+    total: int = Field(..., description="Total number of matches")
+    offset: int = Field(..., description="Offset of the first returned match")
+    limit: int = Field(..., description="Maximum number of matches returned")
+    results: List[SearchResult] = Field(default_factory=list, description="Page of matches")
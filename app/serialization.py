@@ -0,0 +1,141 @@
+"""JSON rendering for project responses, offloaded off the event loop when large."""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+from fastapi.responses import Response
+
+from .models import Project
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+OFFLOAD_MODES = ("inline", "thread")
+
+Payload = Union[Project, List[Project]]
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_payload(payload: Payload) -> bytes:
+    """
+    Encode a project or list of projects to JSON bytes.
+
+    Args:
+        payload: Project or list of projects to encode
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if isinstance(payload, list):
+        data = [project.model_dump(mode="json") for project in payload]
+    else:
+        data = payload.model_dump(mode="json")
+    return _dumps(data)
+
+
+def payload_size(payload: Payload) -> int:
+    """
+    Estimate the encoding cost of a payload as the number of models it
+    contains, counting each project as well as each of its secrets.
+
+    Args:
+        payload: Project or list of projects
+
+    Returns:
+        Number of projects plus number of secrets in the payload
+    """
+    if isinstance(payload, list):
+        return len(payload) + sum(len(project.secrets) for project in payload)
+    return 1 + len(payload.secrets)
+
+
+class ResponseSerializer:
+    def __init__(
+        self,
+        mode: str = "thread",
+        threshold: int = 1000,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            mode: "inline" to always encode on the event loop, "thread" to
+                encode large payloads in a thread pool. There is no process
+                pool mode: pickling the model graph into a worker costs more
+                than encoding it.
+            threshold: Number of projects plus secrets above which a payload is offloaded
+            max_workers: Pool size, defaults to the executor's own default
+        """
+        if mode not in OFFLOAD_MODES:
+            raise ValueError(f"Unknown serialization mode: {mode}")
+        self.mode = mode
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> "ResponseSerializer":
+        """
+        Build a serializer from SERIALIZATION_MODE, SERIALIZATION_THRESHOLD
+        and SERIALIZATION_WORKERS environment variables.
+
+        Returns:
+            Configured ResponseSerializer
+        """
+        workers = os.environ.get("SERIALIZATION_WORKERS")
+        return cls(
+            mode=os.environ.get("SERIALIZATION_MODE", "thread"),
+            threshold=int(os.environ.get("SERIALIZATION_THRESHOLD", "1000")),
+            max_workers=int(workers) if workers else None,
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="serializer",
+            )
+        return self._executor
+
+    def should_offload(self, payload: Payload) -> bool:
+        """
+        Check whether a payload is large enough to be encoded off the event loop.
+
+        Args:
+            payload: Project or list of projects
+
+        Returns:
+            True if the payload should be encoded in the thread pool, False otherwise
+        """
+        return self.mode != "inline" and payload_size(payload) > self.threshold
+
+    async def render(self, payload: Payload) -> Response:
+        """
+        Render a payload as a JSON response.
+
+        Args:
+            payload: Project or list of projects
+
+        Returns:
+            Response containing the encoded JSON body
+        """
+        if self.should_offload(payload):
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(self._get_executor(), encode_payload, payload)
+        else:
+            body = encode_payload(payload)
+        return Response(content=body, media_type="application/json")
+
+    def shutdown(self) -> None:
+        """Shut down the thread pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,42 @@
+"""Production server profile for the Secrets API."""
+import os
+
+import uvicorn
+
+
+def get_server_config() -> dict:
+    """
+    Build uvicorn settings from environment variables.
+
+    The event loop and HTTP parser default to "auto", which selects uvloop
+    and httptools when they are installed (uvicorn[standard]).
+
+    Differences from bare uvicorn: keep-alive is held for 30s instead of 5s,
+    and SERVER_LIMIT_CONCURRENCY defaults to 1024 instead of unlimited. Past
+    that many open connections or in-flight requests, new requests get a 503
+    instead of queueing on the single event loop. Idle keep-alive
+    connections count towards the limit, so it is set well above the
+    expected number of concurrent clients. Set it to 0 to disable the limit.
+    SERVER_BACKLOG only exposes uvicorn's listen backlog, which keeps its
+    default of 2048.
+
+    Returns:
+        Keyword arguments for uvicorn.run
+    """
+    limit_concurrency = int(os.environ.get("SERVER_LIMIT_CONCURRENCY", "1024"))
+    return {
+        "host": os.environ.get("SERVER_HOST", "0.0.0.0"),
+        "port": int(os.environ.get("SERVER_PORT", "8000")),
+        "loop": os.environ.get("SERVER_LOOP", "auto"),
+        "http": os.environ.get("SERVER_HTTP", "auto"),
+        "timeout_keep_alive": int(os.environ.get("SERVER_KEEP_ALIVE", "30")),
+        "limit_concurrency": limit_concurrency or None,
+        "backlog": int(os.environ.get("SERVER_BACKLOG", "2048")),
+        "access_log": os.environ.get("SERVER_ACCESS_LOG", "false").lower() == "true",
+        # Projects are kept in process memory, so a single worker must serve every request
+        "workers": 1,
+    }
+
+
+if __name__ == "__main__":
+    uvicorn.run("app.main:app", **get_server_config())
@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import List, Optional
+from ..models import AuditAction, AuditEvent, AuditMetrics
+
+logger = logging.getLogger(__name__)
+
+# Caller of the current request, set by the HTTP layer
+current_actor: ContextVar[str] = ContextVar("current_actor", default="anonymous")
+
+class AuditService:
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_rows: int = 0,
+        max_age: float = 0,
+    ):
+        """
+        Args:
+            db_path: SQLite database file the events are written to, opened on first use
+            max_queue_size: Maximum number of pending events before new ones are dropped
+            batch_size: Maximum number of events written per transaction
+            flush_interval: Seconds to wait for a batch to fill up before writing it
+            max_rows: Oldest events beyond this many rows are deleted after each write (0 keeps all)
+            max_age: Events older than this many seconds are deleted after each write (0 keeps all)
+        """
+        self.db_path = db_path
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.max_age = max_age
+        # Replaced in start() so the writer always waits on a queue of the running loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._dropped = 0
+        self._written = 0
+        self._pruned = 0
+        # Events taken off the queue by the writer but not yet handed to a write
+        self._pending: list = []
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Callers hold self._lock
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._create_schema()
+        return self._conn
+
+    def _create_schema(self) -> None:
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS audit_events (
+                timestamp REAL NOT NULL,
+                actor TEXT NOT NULL,
+                action TEXT NOT NULL,
+                project_id TEXT,
+                secret_id TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS audit_events_timestamp ON audit_events (timestamp)"
+        )
+        self._conn.commit()
+
+    def record(
+        self,
+        action: AuditAction,
+        project_id: Optional[str] = None,
+        secret_id: Optional[str] = None,
+    ) -> None:
+        """
+        Queue an audit event without blocking. The event is dropped if the queue is full.
+
+        Args:
+            action: Action performed
+            project_id: Project identifier, if any
+            secret_id: Secret identifier, if any
+        """
+        event = (
+            datetime.now(timezone.utc).timestamp(),
+            current_actor.get(),
+            action.value,
+            project_id,
+            secret_id,
+        )
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    def metrics(self) -> AuditMetrics:
+        """
+        Get queue and writer metrics.
+
+        Returns:
+            Current audit metrics
+        """
+        return AuditMetrics(
+            queue_depth=self._queue.qsize(),
+            queue_capacity=self.max_queue_size,
+            dropped_events=self._dropped,
+            written_events=self._written,
+            pruned_events=self._pruned,
+            retention_max_rows=self.max_rows,
+            retention_max_age=self.max_age,
+        )
+
+    def _take_batch(self, size: int) -> list:
+        batch = []
+        while len(batch) < size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    def _write(self, batch: list) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO audit_events VALUES (?, ?, ?, ?, ?)", batch
+                )
+                pruned = 0
+                if self.max_age:
+                    cutoff = datetime.now(timezone.utc).timestamp() - self.max_age
+                    pruned += conn.execute(
+                        "DELETE FROM audit_events WHERE timestamp < ?", (cutoff,)
+                    ).rowcount
+                if self.max_rows:
+                    pruned += conn.execute(
+                        "DELETE FROM audit_events WHERE rowid <= "
+                        "(SELECT MAX(rowid) FROM audit_events) - ?",
+                        (self.max_rows,),
+                    ).rowcount
+            self._written += len(batch)
+            self._pruned += pruned
+
+    def drain(self) -> int:
+        """
+        Synchronously write every pending event.
+
+        Returns:
+            Number of events written
+        """
+        count = 0
+        batch = self._take_batch(self.batch_size)
+        while batch:
+            self._write(batch)
+            count += len(batch)
+            batch = self._take_batch(self.batch_size)
+        return count
+
+    async def _run(self) -> None:
+        while True:
+            self._pending = [await self._queue.get()]
+            if self._queue.qsize() + 1 < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+            batch = self._pending + self._take_batch(self.batch_size - 1)
+            self._pending = []
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception:
+                logger.exception("Failed to write %d audit events", len(batch))
+
+    def _on_writer_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Audit writer stopped", exc_info=task.exception())
+
+    def start(self) -> None:
+        """
+        Start the background task that writes queued events in batches.
+
+        Events recorded before the writer starts are carried over to a queue
+        created on the running event loop, so the service can be started
+        again from a different loop after stop().
+        """
+        if self._task is None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+            for event in self._take_batch(self.max_queue_size):
+                queue.put_nowait(event)
+            self._queue = queue
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(self._on_writer_done)
+
+    async def stop(self) -> None:
+        """Stop the background writer and write any events still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            self._write(self._pending)
+            self._pending = []
+        self.drain()
+
+    def query(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        project_id: Optional[str] = None,
+        actor: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[AuditEvent]:
+        """
+        Query written audit events, oldest first.
+
+        Args:
+            start: Only include events at or after this time (naive values are UTC)
+            end: Only include events before this time (naive values are UTC)
+            project_id: Only include events for this project
+            actor: Only include events by this actor
+            limit: Maximum number of events to return
+            offset: Number of matching events to skip
+
+        Returns:
+            List of matching audit events
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_to_timestamp(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(_to_timestamp(end))
+        if project_id is not None:
+            clauses.append("project_id = ?")
+            params.append(project_id)
+        if actor is not None:
+            clauses.append("actor = ?")
+            params.append(actor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.extend((limit, offset))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT timestamp, actor, action, project_id, secret_id "
+                f"FROM audit_events {where} ORDER BY timestamp, rowid LIMIT ? OFFSET ?",
+                params,
+            ).fetchall()
+        return [
+            AuditEvent(
+                timestamp=datetime.fromtimestamp(row[0], timezone.utc),
+                actor=row[1],
+                action=row[2],
+                project_id=row[3],
+                secret_id=row[4],
+            )
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def _to_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
@@ -1,9 +1,29 @@
 from typing import List, Optional
-from ..models import Project, Secret
+from ulid import ULID
+from ..models import AuditAction, Project, SearchMatch, SearchResults, Secret
+from .audit_service import AuditService
+from .search_index import SearchIndex
 
 class ProjectsService:
-    def __init__(self):
+    def __init__(self, audit_service: Optional[AuditService] = None):
+        """
+        Args:
+            audit_service: Optional audit service that access and mutation events are recorded to
+        """
         self._projects = {}
+        self._audit_service = audit_service
+        self._search_index = SearchIndex()
+        # Projects whose secrets list may be shared with a clone, copied on first in-place write
+        self._shared_secrets = set()
+
+    def _audit(self, action: AuditAction, project_id: Optional[str] = None, secret_id: Optional[str] = None) -> None:
+        if self._audit_service is not None:
+            self._audit_service.record(action, project_id, secret_id)
+
+    def _own_secrets(self, project: Project) -> None:
+        if project.identifier in self._shared_secrets:
+            project.secrets = list(project.secrets)
+            self._shared_secrets.discard(project.identifier)
 
     async def create_project(self, project: Project) -> Project:
         """
@@ -19,6 +39,8 @@ class ProjectsService:
         if project.secrets is None:
             project.secrets = []
         self._projects[project.identifier] = project
+        self._search_index.add_project(project)
+        self._audit(AuditAction.CREATE_PROJECT, project.identifier)
         return project
 
     async def get_project(self, identifier: str) -> Optional[Project]:
@@ -31,7 +53,10 @@ class ProjectsService:
         Returns:
             Project if found, None otherwise
         """
-        return self._projects.get(identifier)
+        project = self._projects.get(identifier)
+        if project:
+            self._audit(AuditAction.READ_PROJECT, identifier)
+        return project
 
     async def list_projects(self) -> List[Project]:
         """
@@ -40,6 +65,7 @@ class ProjectsService:
         Returns:
             List of all projects
         """
+        self._audit(AuditAction.LIST_PROJECTS)
         return list(self._projects.values())
 
     async def update_project(self, identifier: str, project: Project) -> Optional[Project]:
@@ -57,6 +83,9 @@ class ProjectsService:
             return None
         project.identifier = identifier
         self._projects[identifier] = project
+        self._shared_secrets.discard(identifier)
+        self._search_index.add_project(project)
+        self._audit(AuditAction.UPDATE_PROJECT, identifier)
         return project
 
     async def delete_project(self, identifier: str) -> bool:
@@ -72,6 +101,9 @@ class ProjectsService:
         if identifier not in self._projects:
             return False
         del self._projects[identifier]
+        self._shared_secrets.discard(identifier)
+        self._search_index.remove_project(identifier)
+        self._audit(AuditAction.DELETE_PROJECT, identifier)
         return True
 
     async def create_secret(self, project_id: str, secret: Secret) -> Optional[Project]:
@@ -85,11 +117,14 @@ class ProjectsService:
         Returns:
             Updated project if found, None otherwise
         """
-        project = await self.get_project(project_id)
+        project = self._projects.get(project_id)
         if not project:
             return None
+        self._own_secrets(project)
         project.secrets.append(secret)
         self._projects[project_id] = project
+        self._search_index.add_secret(project_id, secret.identifier, secret.name)
+        self._audit(AuditAction.CREATE_SECRET, project_id, secret.identifier)
         return project
 
     async def list_project_secrets(self, project_id: str) -> Optional[List[Secret]]:
@@ -102,9 +137,10 @@ class ProjectsService:
         Returns:
             List of secrets if project found, None otherwise
         """
-        project = await self.get_project(project_id)
+        project = self._projects.get(project_id)
         if not project:
             return None
+        self._audit(AuditAction.LIST_SECRETS, project_id)
         return project.secrets
 
     async def update_secret(self, project_id: str, secret_id: str, secret: Secret) -> Optional[Project]:
@@ -119,15 +155,18 @@ class ProjectsService:
         Returns:
             Updated project if found and secret updated, None otherwise
         """
-        project = await self.get_project(project_id)
+        project = self._projects.get(project_id)
         if not project:
             return None
 
         for i, existing_secret in enumerate(project.secrets):
             if existing_secret.identifier == secret_id:
                 secret.identifier = secret_id  # Ensure identifier remains the same
+                self._own_secrets(project)
                 project.secrets[i] = secret
                 self._projects[project_id] = project
+                self._search_index.add_secret(project_id, secret_id, secret.name)
+                self._audit(AuditAction.UPDATE_SECRET, project_id, secret_id)
                 return project
         return None
 
@@ -142,7 +181,7 @@ class ProjectsService:
         Returns:
             Updated project if found and secret removed, None otherwise
         """
-        project = await self.get_project(project_id)
+        project = self._projects.get(project_id)
         if not project:
             return None
 
@@ -151,4 +190,66 @@ class ProjectsService:
         if len(project.secrets) == original_length:
             return None  # Secret not found
         self._projects[project_id] = project
+        self._shared_secrets.discard(project_id)
+        self._search_index.remove_secret(project_id, secret_id)
+        self._audit(AuditAction.DELETE_SECRET, project_id, secret_id)
         return project
+
+    async def clone_project(self, project_id: str, name: str) -> Optional[Project]:
+        """
+        Clone a project. The clone shares the source project's secrets
+        copy-on-write, so cloning takes constant time until either project's
+        secrets are modified.
+
+        Secret identifiers are scoped to their project, so the clone keeps the
+        source's secret identifiers; only the clone itself gets a new identifier.
+
+        Args:
+            project_id: Identifier of the project to clone
+            name: Name of the new project
+
+        Returns:
+            Cloned project if source found, None otherwise
+        """
+        source = self._projects.get(project_id)
+        if not source:
+            return None
+        clone = Project.model_construct(
+            name=name,
+            secrets=source.secrets,
+            identifier=str(ULID())
+        )
+        self._projects[clone.identifier] = clone
+        self._shared_secrets.update((project_id, clone.identifier))
+        self._search_index.defer_project(clone)
+        self._audit(AuditAction.READ_PROJECT, project_id)
+        self._audit(AuditAction.CLONE_PROJECT, clone.identifier)
+        return clone
+
+    async def search(
+        self,
+        query: str,
+        match: SearchMatch = SearchMatch.TOKEN,
+        offset: int = 0,
+        limit: int = 50
+    ) -> SearchResults:
+        """
+        Search project and secret names. Secret values are never searched or returned.
+
+        Args:
+            query: Search text
+            match: Match every query token, or match the query as a substring
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return
+
+        Returns:
+            Page of search results
+        """
+        total, results = self._search_index.search(query, match, offset, limit)
+        self._audit(AuditAction.SEARCH)
+        return SearchResults(
+            total=total,
+            offset=offset,
+            limit=limit,
+            results=results
+        )
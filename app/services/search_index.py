@@ -0,0 +1,224 @@
+import heapq
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from ..models import Project, SearchMatch, SearchResult
+
+# A document is a project (secret_id None) or a secret within a project
+DocKey = Tuple[str, Optional[str]]
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+# Substring queries are answered from trigram postings, so they need at least one trigram
+MIN_SUBSTRING_LENGTH = 3
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a name into lowercase alphanumeric tokens, e.g. "DB_PASSWORD" -> ["db", "password"].
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of non-empty tokens
+    """
+    return [token for token in _TOKEN_SPLIT.split(text.lower()) if token]
+
+def _trigrams(term: str) -> Set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+class SearchIndex:
+    """Inverted index over project and secret names, maintained incrementally."""
+
+    def __init__(self):
+        self._project_names: Dict[str, str] = {}
+        self._secret_names: Dict[DocKey, str] = {}
+        self._project_secrets: Dict[str, Set[str]] = defaultdict(set)
+        # token -> documents whose name contains the token
+        self._tokens: Dict[str, Set[DocKey]] = defaultdict(set)
+        # lowercased name -> documents with that name
+        self._names: Dict[str, Set[DocKey]] = defaultdict(set)
+        # trigram -> lowercased names containing the trigram
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        # Projects registered but not yet indexed, indexed from their current state when needed
+        self._pending: Dict[str, Project] = {}
+
+    def clear(self) -> None:
+        """Remove every document from the index."""
+        self.__init__()
+
+    def defer_project(self, project: Project) -> None:
+        """
+        Register a project to be indexed lazily, before the next search or
+        change to that project.
+
+        Args:
+            project: Project to index
+        """
+        self._pending[project.identifier] = project
+
+    def _flush(self, project_id: Optional[str] = None) -> None:
+        if project_id is None:
+            pending, self._pending = self._pending, {}
+            for project in pending.values():
+                self.add_project(project)
+        elif project_id in self._pending:
+            self.add_project(self._pending.pop(project_id))
+
+    def _add_doc(self, key: DocKey, name: str) -> None:
+        for token in tokenize(name):
+            self._tokens[token].add(key)
+        term = name.lower()
+        if not self._names[term]:
+            for trigram in _trigrams(term):
+                self._trigrams[trigram].add(term)
+        self._names[term].add(key)
+
+    def _remove_doc(self, key: DocKey, name: str) -> None:
+        for token in tokenize(name):
+            postings = self._tokens.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._tokens[token]
+        term = name.lower()
+        postings = self._names.get(term)
+        if postings is not None:
+            postings.discard(key)
+            if not postings:
+                del self._names[term]
+                for trigram in _trigrams(term):
+                    terms = self._trigrams[trigram]
+                    terms.discard(term)
+                    if not terms:
+                        del self._trigrams[trigram]
+
+    def add_project(self, project: Project) -> None:
+        """
+        Index a project and all of its secrets.
+
+        Args:
+            project: Project to index
+        """
+        self._pending.pop(project.identifier, None)
+        self.remove_project(project.identifier)
+        self._project_names[project.identifier] = project.name
+        self._add_doc((project.identifier, None), project.name)
+        for secret in project.secrets:
+            self.add_secret(project.identifier, secret.identifier, secret.name)
+
+    def remove_project(self, project_id: str) -> None:
+        """
+        Remove a project and all of its secrets from the index.
+
+        Args:
+            project_id: Project identifier
+        """
+        self._pending.pop(project_id, None)
+        name = self._project_names.pop(project_id, None)
+        if name is None:
+            return
+        self._remove_doc((project_id, None), name)
+        for secret_id in list(self._project_secrets.get(project_id, ())):
+            self.remove_secret(project_id, secret_id)
+        self._project_secrets.pop(project_id, None)
+
+    def add_secret(self, project_id: str, secret_id: str, name: str) -> None:
+        """
+        Index a secret name.
+
+        Args:
+            project_id: Identifier of the project holding the secret
+            secret_id: Secret identifier
+            name: Secret name
+        """
+        self._flush(project_id)
+        key = (project_id, secret_id)
+        self.remove_secret(project_id, secret_id)
+        self._secret_names[key] = name
+        self._project_secrets[project_id].add(secret_id)
+        self._add_doc(key, name)
+
+    def remove_secret(self, project_id: str, secret_id: str) -> None:
+        """
+        Remove a secret from the index.
+
+        Args:
+            project_id: Identifier of the project holding the secret
+            secret_id: Secret identifier
+        """
+        self._flush(project_id)
+        key = (project_id, secret_id)
+        name = self._secret_names.pop(key, None)
+        if name is None:
+            return
+        self._project_secrets[project_id].discard(secret_id)
+        self._remove_doc(key, name)
+
+    def _token_matches(self, query: str) -> Set[DocKey]:
+        tokens = tokenize(query)
+        if not tokens:
+            return set()
+        postings = sorted((self._tokens.get(token, set()) for token in tokens), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _substring_matches(self, query: str) -> Set[DocKey]:
+        term = query.lower()
+        if len(term) < MIN_SUBSTRING_LENGTH:
+            return set()
+        candidates = sorted((self._trigrams.get(t, set()) for t in _trigrams(term)), key=len)
+        names = set(candidates[0]).intersection(*candidates[1:])
+        matches: Set[DocKey] = set()
+        for name in names:
+            if term in name:
+                matches.update(self._names[name])
+        return matches
+
+    def search(
+        self,
+        query: str,
+        match: SearchMatch = SearchMatch.TOKEN,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[int, List[SearchResult]]:
+        """
+        Find projects and secrets whose names match a query.
+
+        Substring queries shorter than MIN_SUBSTRING_LENGTH match nothing.
+
+        Args:
+            query: Search text
+            match: Match every query token, or match the query as a substring
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return
+
+        Returns:
+            Total number of matches, and the requested page of matches ordered
+            by project name, then secret name
+        """
+        self._flush()
+        if match == SearchMatch.SUBSTRING:
+            keys = self._substring_matches(query)
+        else:
+            keys = self._token_matches(query)
+        rows = (
+            (
+                self._project_names[project_id],
+                project_id,
+                self._secret_names[(project_id, secret_id)] if secret_id else "",
+                secret_id or "",
+            )
+            for project_id, secret_id in keys
+        )
+        # Only the rows up to the end of the page need to be ordered
+        page = [
+            SearchResult(
+                project_id=project_id,
+                project_name=project_name,
+                secret_id=secret_id or None,
+                secret_name=secret_name if secret_id else None,
+            )
+            for project_name, project_id, secret_name, secret_id
+            in heapq.nsmallest(offset + limit, rows)[offset:]
+        ]
+        return len(keys), page
@@ -0,0 +1,142 @@
+"""
+Compare the bare uvicorn defaults against the production server profile.
+
+Each configuration is started in a subprocess, seeded with projects and
+hammered with concurrent GET /projects/ and GET /projects/{identifier}
+requests. At the default concurrency this measures compression and the
+event loop and HTTP parser; the profile's concurrency limit only sheds load
+above 1024 open connections. Usage:
+
+    python benchmarks/bench_server.py --projects 50 --secrets 200 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGURATIONS = [
+    {
+        "name": "defaults (asyncio, h11, no compression)",
+        "command": [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", "{port}", "--loop", "asyncio", "--http", "h11", "--log-level", "warning",
+        ],
+        "env": {},
+        "accept_encoding": "identity",
+    },
+    {
+        "name": "production profile (auto loop/http, brotli)",
+        "command": [sys.executable, "-m", "app.server"],
+        "env": {"SERVER_PORT": "{port}"},
+        "accept_encoding": "br, gzip",
+    },
+    {
+        "name": "production profile (auto loop/http, gzip)",
+        "command": [sys.executable, "-m", "app.server"],
+        "env": {"SERVER_PORT": "{port}"},
+        "accept_encoding": "gzip",
+    },
+]
+
+
+async def wait_until_ready(base_url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/audit/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def seed(client: httpx.AsyncClient, projects: int, secrets: int) -> list:
+    identifiers = []
+    for p in range(projects):
+        project = {
+            "name": f"project-{p}",
+            "secrets": [
+                {"name": f"SERVICE_{s}_PASSWORD", "value": f"value-{p}-{s}", "source": "OTHER"}
+                for s in range(secrets)
+            ],
+        }
+        response = await client.post("/projects/", json=project)
+        identifiers.append(response.json()["identifier"])
+    return identifiers
+
+
+async def run_load(client: httpx.AsyncClient, paths: list, concurrency: int) -> dict:
+    latencies = []
+    wire_bytes = 0
+    queue = list(paths)
+
+    async def worker():
+        nonlocal wire_bytes
+        while queue:
+            path = queue.pop()
+            start = time.perf_counter()
+            response = await client.get(path)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            wire_bytes += response.num_bytes_downloaded
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "kib_per_request": wire_bytes / len(latencies) / 1024,
+    }
+
+
+async def bench(config: dict, port: int, args: argparse.Namespace) -> dict:
+    command = [part.format(port=port) for part in config["command"]]
+    env = dict(os.environ, **{k: v.format(port=port) for k, v in config["env"].items()})
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_until_ready(base_url)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        headers = {"Accept-Encoding": config["accept_encoding"]}
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, headers=headers, timeout=60) as client:
+            identifiers = await seed(client, args.projects, args.secrets)
+            paths = []
+            for i in range(args.requests):
+                paths.append("/projects/" if i % 10 == 0 else f"/projects/{identifiers[i % len(identifiers)]}")
+            return await run_load(client, paths, args.concurrency)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--secrets", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'configuration':<45} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'KiB/req':>9}")
+    for offset, config in enumerate(CONFIGURATIONS):
+        result = asyncio.run(bench(config, args.port + offset, args))
+        print(
+            f"{config['name']:<45} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} "
+            f"{result['p99_ms']:>8.1f} {result['kib_per_request']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
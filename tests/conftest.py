@@ -17,5 +17,9 @@ def projects_service():
 def clear_projects(projects_service):
     """Clear projects and their secrets before each test."""
     projects_service._projects.clear()
+    projects_service._search_index.clear()
+    projects_service._shared_secrets.clear()
     yield
     projects_service._projects.clear()
+    projects_service._search_index.clear()
+    projects_service._shared_secrets.clear()
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, get_projects_service, get_audit_service
+from app.models import AuditAction, Source
+from app.services.audit_service import AuditService
+from app.services.projects_service import ProjectsService
+
+@pytest.fixture
+def audit_service():
+    service = AuditService(max_queue_size=100)
+    yield service
+    service.close()
+
+@pytest.fixture
+def client(audit_service):
+    service = ProjectsService(audit_service)
+    app.dependency_overrides[get_projects_service] = lambda: service
+    app.dependency_overrides[get_audit_service] = lambda: audit_service
+    yield TestClient(app)
+    del app.dependency_overrides[get_projects_service]
+    del app.dependency_overrides[get_audit_service]
+
+def test_access_and_mutation_events(client, audit_service):
+    headers = {"X-Actor": "alice"}
+    project = client.post("/projects/", json={"name": "audited"}, headers=headers).json()
+    secret_response = client.post(
+        f"/projects/{project['identifier']}/secrets",
+        json={"name": "DB_PASSWORD", "value": "hunter2", "source": Source.OTHER.value},
+        headers=headers
+    )
+    secret = secret_response.json()["secrets"][0]
+    client.get(f"/projects/{project['identifier']}/secrets")
+
+    metrics = client.get("/audit/metrics").json()
+    assert metrics["queue_depth"] == 3
+    assert metrics["dropped_events"] == 0
+
+    assert audit_service.drain() == 3
+    response = client.get("/audit/events", params={"project_id": project["identifier"]})
+    assert response.status_code == 200
+    events = response.json()
+    assert [e["action"] for e in events] == [
+        AuditAction.CREATE_PROJECT.value,
+        AuditAction.CREATE_SECRET.value,
+        AuditAction.LIST_SECRETS.value,
+    ]
+    assert [e["actor"] for e in events] == ["alice", "alice", "anonymous"]
+    assert events[1]["secret_id"] == secret["identifier"]
+    assert "hunter2" not in response.text
+
+    metrics = client.get("/audit/metrics").json()
+    assert metrics["queue_depth"] == 0
+    assert metrics["written_events"] == 3
+
+def test_time_range_filter(client, audit_service):
+    client.get("/projects/")
+    audit_service.drain()
+
+    now = datetime.now(timezone.utc)
+    past = client.get("/audit/events", params={"end": (now - timedelta(hours=1)).isoformat()})
+    assert past.json() == []
+    recent = client.get("/audit/events", params={"start": (now - timedelta(hours=1)).isoformat()})
+    assert len(recent.json()) == 1
+    assert recent.json()[0]["action"] == AuditAction.LIST_PROJECTS.value
+
+def test_query_pagination(client, audit_service):
+    for _ in range(5):
+        client.get("/projects/", headers={"X-Actor": "bob"})
+    audit_service.drain()
+
+    first = client.get("/audit/events", params={"limit": 2}).json()
+    second = client.get("/audit/events", params={"limit": 2, "offset": 2}).json()
+    rest = client.get("/audit/events", params={"offset": 4}).json()
+    assert len(first) == 2 and len(second) == 2 and len(rest) == 1
+    assert first[-1]["timestamp"] <= second[0]["timestamp"] <= rest[0]["timestamp"]
+
+    assert client.get("/audit/events", params={"limit": -1}).status_code == 422
+    assert client.get("/audit/events", params={"limit": 1001}).status_code == 422
+    assert client.get("/audit/events", params={"offset": -1}).status_code == 422
+
+def test_retention_prunes_oldest_events():
+    audit_service = AuditService(max_rows=3)
+    for _ in range(5):
+        audit_service.record(AuditAction.LIST_PROJECTS)
+    audit_service.drain()
+    assert len(audit_service.query()) == 3
+    metrics = audit_service.metrics()
+    assert metrics.written_events == 5
+    assert metrics.pruned_events == 2
+    assert metrics.retention_max_rows == 3
+
+    aged = AuditService(max_age=60)
+    aged._write([(0.0, "old", AuditAction.LIST_PROJECTS.value, None, None)])
+    assert aged.query() == []
+    assert aged.metrics().pruned_events == 1
+    audit_service.close()
+    aged.close()
+
+def test_full_queue_drops_events():
+    audit_service = AuditService(max_queue_size=2)
+    for _ in range(5):
+        audit_service.record(AuditAction.LIST_PROJECTS)
+    metrics = audit_service.metrics()
+    assert metrics.queue_depth == 2
+    assert metrics.dropped_events == 3
+    audit_service.close()
+
+@pytest.mark.asyncio
+async def test_background_writer_batches_events():
+    audit_service = AuditService(batch_size=2, flush_interval=0.01)
+    audit_service.start()
+    for _ in range(5):
+        audit_service.record(AuditAction.LIST_PROJECTS)
+    for _ in range(100):
+        if audit_service.metrics().written_events == 5:
+            break
+        await asyncio.sleep(0.01)
+    await audit_service.stop()
+    assert audit_service.metrics().written_events == 5
+    assert len(audit_service.query()) == 5
+    audit_service.close()
+
+@pytest.mark.asyncio
+async def test_stop_while_writer_waits_for_batch():
+    audit_service = AuditService(flush_interval=10)
+    audit_service.start()
+    for _ in range(5):
+        audit_service.record(AuditAction.LIST_PROJECTS)
+    await asyncio.sleep(0.1)
+    await audit_service.stop()
+    metrics = audit_service.metrics()
+    assert metrics.written_events == 5
+    assert metrics.dropped_events == 0
+    assert len(audit_service.query()) == 5
+    audit_service.close()
+
+def test_restart_on_new_event_loop():
+    audit_service = AuditService(flush_interval=0.01)
+    audit_service.record(AuditAction.LIST_PROJECTS)
+
+    async def run_once():
+        audit_service.start()
+        # Let the writer block on the empty queue before recording
+        await asyncio.sleep(0.05)
+        audit_service.record(AuditAction.LIST_PROJECTS)
+        for _ in range(100):
+            if audit_service.metrics().queue_depth == 0:
+                break
+            await asyncio.sleep(0.01)
+        await audit_service.stop()
+
+    # Each asyncio.run uses a fresh event loop, like repeated app lifespans
+    asyncio.run(run_once())
+    asyncio.run(run_once())
+    metrics = audit_service.metrics()
+    assert metrics.written_events == 3
+    assert metrics.dropped_events == 0
+    audit_service.close()
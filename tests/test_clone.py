@@ -0,0 +1,78 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, get_projects_service
+from app.models import Source
+
+@pytest.fixture
+def client(projects_service):
+    app.dependency_overrides[get_projects_service] = lambda: projects_service
+    return TestClient(app)
+
+@pytest.fixture
+def source(client):
+    project = client.post("/projects/", json={"name": "production", "secrets": []}).json()
+    for name in ("DB_PASSWORD", "API_KEY"):
+        project = client.post(
+            f"/projects/{project['identifier']}/secrets",
+            json={"name": name, "value": f"{name.lower()}-value", "source": Source.AWS_SAM.value}
+        ).json()
+    return project
+
+def test_clone_project(client, projects_service, source):
+    response = client.post(f"/projects/{source['identifier']}/clone", json={"name": "staging"})
+    assert response.status_code == 200
+    clone = response.json()
+    assert clone == {"identifier": clone["identifier"], "name": "staging", "secret_count": 2}
+    assert clone["identifier"] != source["identifier"]
+
+    # Secrets are shared until either project writes to them
+    source_project = projects_service._projects[source["identifier"]]
+    clone_project = projects_service._projects[clone["identifier"]]
+    assert clone_project.secrets is source_project.secrets
+
+    cloned = client.get(f"/projects/{clone['identifier']}").json()
+    assert cloned["name"] == "staging"
+    assert cloned["secrets"] == source["secrets"]
+    assert client.post("/projects/non-existent/clone", json={"name": "staging"}).status_code == 404
+
+def test_clone_diverges_copy_on_write(client, projects_service, source):
+    clone = client.post(f"/projects/{source['identifier']}/clone", json={"name": "staging"}).json()
+    db_password, api_key = source["secrets"]
+
+    # Updating a secret in the clone leaves the source untouched
+    client.put(
+        f"/projects/{clone['identifier']}/secrets/{db_password['identifier']}",
+        json={"name": "DB_PASSWORD", "value": "staging-value", "source": Source.OTHER.value}
+    )
+    clone_secrets = client.get(f"/projects/{clone['identifier']}/secrets").json()
+    source_secrets = client.get(f"/projects/{source['identifier']}/secrets").json()
+    assert clone_secrets[0]["value"] == "staging-value"
+    assert source_secrets[0]["value"] == "db_password-value"
+
+    # Unchanged secrets are still the same objects
+    source_project = projects_service._projects[source["identifier"]]
+    clone_project = projects_service._projects[clone["identifier"]]
+    assert clone_project.secrets is not source_project.secrets
+    assert clone_project.secrets[1] is source_project.secrets[1]
+
+    # Adding to or deleting from the source leaves the clone untouched
+    client.post(
+        f"/projects/{source['identifier']}/secrets",
+        json={"name": "NEW_KEY", "value": "new", "source": Source.OTHER.value}
+    )
+    client.delete(f"/projects/{source['identifier']}/secrets/{api_key['identifier']}")
+    assert len(client.get(f"/projects/{source['identifier']}/secrets").json()) == 2
+    assert [s["name"] for s in client.get(f"/projects/{clone['identifier']}/secrets").json()] == [
+        "DB_PASSWORD", "API_KEY"
+    ]
+
+def test_clone_is_searchable(client, source):
+    clone = client.post(f"/projects/{source['identifier']}/clone", json={"name": "staging"}).json()
+
+    data = client.get("/search", params={"q": "password"}).json()
+    assert {r["project_name"] for r in data["results"]} == {"production", "staging"}
+
+    secret_id = source["secrets"][0]["identifier"]
+    client.delete(f"/projects/{clone['identifier']}/secrets/{secret_id}")
+    data = client.get("/search", params={"q": "password"}).json()
+    assert [r["project_name"] for r in data["results"]] == ["production"]
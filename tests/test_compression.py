@@ -0,0 +1,60 @@
+import gzip
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+from app.compression import CompressionMiddleware, parse_accept_encoding
+
+BODY = b'{"name":"DB_PASSWORD","value":"x"}' * 100
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, offload_size=2048)
+
+    @app.get("/large")
+    async def large():
+        return Response(content=BODY, media_type="application/json")
+
+    @app.get("/small")
+    async def small():
+        return Response(content=b"{}", media_type="application/json")
+
+    return TestClient(app)
+
+def raw_get(client, path, accept_encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate, br") == {"gzip": 1.0, "deflate": 1.0, "br": 1.0}
+    assert parse_accept_encoding("br;q=0, GZIP;q=0.5") == {"br": 0.0, "gzip": 0.5}
+    assert parse_accept_encoding("gzip;q=1, br;q=0.1") == {"gzip": 1.0, "br": 0.1}
+    assert parse_accept_encoding("*") == {"*": 1.0}
+    assert parse_accept_encoding("") == {}
+
+@pytest.mark.parametrize("accept_encoding, encoding, decompress", [
+    ("gzip, br", "br", brotli.decompress),
+    ("gzip", "gzip", gzip.decompress),
+    ("br;q=0, gzip", "gzip", gzip.decompress),
+    ("gzip;q=1, br;q=0.1", "gzip", gzip.decompress),
+    ("*", "br", brotli.decompress),
+    ("br;q=0, *;q=0.5", "gzip", gzip.decompress),
+])
+def test_large_response_is_compressed(client, accept_encoding, encoding, decompress):
+    response, raw = raw_get(client, "/large", accept_encoding)
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-length"] == str(len(raw))
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert decompress(raw) == BODY
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip, br"),
+    ("/large", "identity"),
+    ("/large", "*;q=0"),
+])
+def test_response_is_not_compressed(client, path, accept_encoding):
+    response, raw = raw_get(client, path, accept_encoding)
+    assert "content-encoding" not in response.headers
+    assert raw in (BODY, b"{}")
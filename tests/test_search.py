@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, get_projects_service
+from app.models import Source
+
+@pytest.fixture
+def client(projects_service):
+    app.dependency_overrides[get_projects_service] = lambda: projects_service
+    return TestClient(app)
+
+def create_project(client, name, secret_names):
+    project = client.post("/projects/", json={"name": name, "secrets": []}).json()
+    for secret_name in secret_names:
+        project = client.post(
+            f"/projects/{project['identifier']}/secrets",
+            json={"name": secret_name, "value": "super-secret-value", "source": Source.OTHER.value}
+        ).json()
+    return project
+
+def test_token_search(client):
+    billing = create_project(client, "billing-api", ["DB_PASSWORD", "STRIPE_KEY"])
+    create_project(client, "auth-service", ["JWT_SECRET"])
+
+    response = client.get("/search", params={"q": "password"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    result = data["results"][0]
+    assert result["project_id"] == billing["identifier"]
+    assert result["project_name"] == "billing-api"
+    assert result["secret_name"] == "DB_PASSWORD"
+    assert "super-secret-value" not in response.text
+
+    # Every token must match, in any order
+    assert client.get("/search", params={"q": "password db"}).json()["total"] == 1
+    assert client.get("/search", params={"q": "db key"}).json()["total"] == 0
+
+    # Projects are indexed by name as well
+    data = client.get("/search", params={"q": "api"}).json()
+    assert data["total"] == 1
+    assert data["results"][0]["secret_id"] is None
+
+def test_substring_search(client):
+    create_project(client, "billing-api", ["DB_PASSWORD", "STRIPE_KEY"])
+    create_project(client, "auth-service", ["JWT_SECRET"])
+
+    data = client.get("/search", params={"q": "ASSW", "match": "substring"}).json()
+    assert [r["secret_name"] for r in data["results"]] == ["DB_PASSWORD"]
+
+    data = client.get("/search", params={"q": "ret", "match": "substring"}).json()
+    assert [r["secret_name"] for r in data["results"]] == ["JWT_SECRET"]
+
+    data = client.get("/search", params={"q": "ice", "match": "substring"}).json()
+    assert [(r["project_name"], r["secret_name"]) for r in data["results"]] == [("auth-service", None)]
+
+    # Substring queries shorter than a trigram would have to scan every name
+    response = client.get("/search", params={"q": "ke", "match": "substring"})
+    assert response.status_code == 422
+
+def test_search_follows_mutations(client):
+    project = create_project(client, "billing-api", ["DB_PASSWORD"])
+    secret = project["secrets"][0]
+
+    client.put(
+        f"/projects/{project['identifier']}/secrets/{secret['identifier']}",
+        json={"name": "DB_USER", "value": "admin", "source": Source.OTHER.value}
+    )
+    assert client.get("/search", params={"q": "password"}).json()["total"] == 0
+    assert client.get("/search", params={"q": "user"}).json()["total"] == 1
+
+    client.delete(f"/projects/{project['identifier']}/secrets/{secret['identifier']}")
+    assert client.get("/search", params={"q": "user"}).json()["total"] == 0
+
+    client.put(f"/projects/{project['identifier']}", json={"name": "payments", "secrets": []})
+    assert client.get("/search", params={"q": "billing"}).json()["total"] == 0
+    assert client.get("/search", params={"q": "payments"}).json()["total"] == 1
+
+    client.delete(f"/projects/{project['identifier']}")
+    assert client.get("/search", params={"q": "payments"}).json()["total"] == 0
+
+def test_search_pagination(client):
+    create_project(client, "app", [f"KEY_{i}" for i in range(5)])
+
+    data = client.get("/search", params={"q": "key", "offset": 1, "limit": 2}).json()
+    assert data["total"] == 5
+    assert data["offset"] == 1
+    assert data["limit"] == 2
+    assert [r["secret_name"] for r in data["results"]] == ["KEY_1", "KEY_2"]
+
+    assert client.get("/search", params={"q": ""}).status_code == 422
+    assert client.get("/search", params={"q": "key", "limit": 0}).status_code == 422
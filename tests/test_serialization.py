@@ -0,0 +1,58 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, get_projects_service, get_response_serializer
+from app.models import Project, Secret, Source
+from app.serialization import ResponseSerializer, encode_payload
+
+def make_project(secret_count):
+    return Project(
+        name="large-project",
+        secrets=[
+            Secret(name=f"secret{i}", value=f"value{i}", source=Source.OTHER)
+            for i in range(secret_count)
+        ]
+    )
+
+@pytest.fixture(params=["inline", "thread"])
+def client(request, projects_service):
+    serializer = ResponseSerializer(mode=request.param, threshold=2, max_workers=1)
+    app.dependency_overrides[get_projects_service] = lambda: projects_service
+    app.dependency_overrides[get_response_serializer] = lambda: serializer
+    yield TestClient(app)
+    del app.dependency_overrides[get_response_serializer]
+    serializer.shutdown()
+
+def test_encode_payload_matches_model_dump():
+    project = make_project(3)
+    assert json.loads(encode_payload(project)) == project.model_dump(mode="json")
+    assert json.loads(encode_payload([project])) == [project.model_dump(mode="json")]
+
+def test_should_offload():
+    serializer = ResponseSerializer(mode="thread", threshold=3)
+    assert not serializer.should_offload(make_project(2))
+    assert serializer.should_offload(make_project(3))
+    assert serializer.should_offload([make_project(1), make_project(1)])
+    # Long lists of projects are offloaded even when they hold few secrets
+    assert serializer.should_offload([make_project(0) for _ in range(4)])
+    assert not ResponseSerializer(mode="inline", threshold=0).should_offload(make_project(3))
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        ResponseSerializer(mode="process")
+
+def test_large_project_responses(client, projects_service):
+    small = make_project(1)
+    large = make_project(5)
+    for project in (small, large):
+        projects_service._projects[project.identifier] = project
+
+    for project in (small, large):
+        response = client.get(f"/projects/{project.identifier}")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == project.model_dump(mode="json")
+
+    response = client.get("/projects/")
+    assert response.status_code == 200
+    assert response.json() == [small.model_dump(mode="json"), large.model_dump(mode="json")]
@@ -0,0 +1,14 @@
+from app.server import get_server_config
+
+def test_default_server_config(monkeypatch):
+    monkeypatch.delenv("SERVER_LIMIT_CONCURRENCY", raising=False)
+    config = get_server_config()
+    assert config["limit_concurrency"] == 1024
+    assert config["timeout_keep_alive"] == 30
+    assert config["workers"] == 1
+
+def test_concurrency_limit_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("SERVER_LIMIT_CONCURRENCY", "0")
+    assert get_server_config()["limit_concurrency"] is None
+    monkeypatch.setenv("SERVER_LIMIT_CONCURRENCY", "256")
+    assert get_server_config()["limit_concurrency"] == 256